@@ -0,0 +1,316 @@
+"""
+Concurrent-session load generator for the elastica MCP server.
+
+The server is instantiated in-process and every simulated client talks to it
+through its own in-memory MCP transport, so the load test runs fully offline.
+"""
+
+from typing import Any
+from dataclasses import dataclass, field
+import argparse
+import json
+import random
+import resource
+import sys
+import time
+
+import anyio
+import numpy as np
+from mcp.client.session import ClientSession
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.server.fastmcp import FastMCP
+
+from .server import instantiate_server
+from .simulation.manager import MAX_SIMULATION_COUNT
+
+DEFAULT_OPERATION_MIX: dict[str, float] = {
+    "create_simulator": 0.05,
+    "create_rod": 0.15,
+    "run_simulation": 0.3,
+    "get_current_position": 0.5,
+}
+
+DEFAULT_ROD_PARAMS: dict[str, Any] = {
+    "start_position": (0.0, 0.0, 0.0),
+    "direction": (0.0, 0.0, 1.0),
+    "normal": (0.0, 1.0, 0.0),
+    "base_length": 0.35,
+    "base_radius": 0.35 * 0.011,
+}
+
+DEFAULT_MATERIAL: dict[str, Any] = {
+    "density": 1000,
+    "youngs_modulus": 1e6,
+}
+
+
+@dataclass
+class LoadTestConfig:
+    """
+    Configuration of a load test.
+
+    Attributes:
+        n_clients: Number of concurrent simulated clients. Each client owns one
+            simulator, so this must not exceed the Manager simulation limit.
+        n_operations: Number of operations issued by each client.
+        operation_mix: Relative weights of the operations drawn by the clients.
+        run_time: Simulated time advanced by each run_simulation call.
+        max_rods: Maximum number of rods a client adds to one simulator.
+        seed: Seed of the random operation sequence.
+    """
+
+    n_clients: int = 4
+    n_operations: int = 50
+    operation_mix: dict[str, float] = field(
+        default_factory=lambda: dict(DEFAULT_OPERATION_MIX)
+    )
+    run_time: float = 0.01
+    max_rods: int = 3
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.n_clients <= MAX_SIMULATION_COUNT:
+            raise ValueError(
+                f"Number of clients must be between 1 and {MAX_SIMULATION_COUNT}, got {self.n_clients}"
+            )
+        invalid_operations = set(self.operation_mix) - set(DEFAULT_OPERATION_MIX)
+        if invalid_operations:
+            raise ValueError(
+                f"Invalid operation names: {sorted(invalid_operations)}, allowed operations are {sorted(DEFAULT_OPERATION_MIX)}"
+            )
+        if any(weight < 0 for weight in self.operation_mix.values()) or not any(
+            weight > 0 for weight in self.operation_mix.values()
+        ):
+            raise ValueError(
+                f"Operation weights must be non-negative with a positive sum, got {self.operation_mix}"
+            )
+
+
+@dataclass
+class _ClientState:
+    simulator_tag: str
+    rod_tags: list[str] = field(default_factory=list)
+    created: bool = False
+    finalized: bool = False
+    has_run: bool = False
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.skipped: dict[str, int] = {}
+
+    def skip(self, name: str) -> None:
+        self.skipped[name] = self.skipped.get(name, 0) + 1
+
+    async def call(
+        self, session: ClientSession, name: str, arguments: dict[str, Any]
+    ) -> bool:
+        start_time = time.perf_counter()
+        result = await session.call_tool(name, arguments)
+        self.latencies.setdefault(name, []).append(time.perf_counter() - start_time)
+        if result.isError:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            return False
+        return True
+
+
+def _max_rss_bytes() -> int:
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    return int(max_rss if sys.platform == "darwin" else max_rss * 1024)
+
+
+def summarize_latencies(latencies: list[float]) -> dict[str, float]:
+    """
+    Summarize tool latencies.
+
+    Args:
+        latencies: Measured latencies in seconds.
+
+    Returns:
+        Count, mean and p50/p95/p99 latency in milliseconds.
+    """
+    samples = np.asarray(latencies, dtype=np.float64) * 1e3
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "count": int(samples.size),
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
+
+
+async def _reset_simulator(
+    session: ClientSession, recorder: _Recorder, state: _ClientState
+) -> None:
+    if state.created:
+        await recorder.call(
+            session, "delete_simulator", {"simulator_tag": state.simulator_tag}
+        )
+    state.created = await recorder.call(
+        session, "create_simulator", {"simulator_tag": state.simulator_tag}
+    )
+    state.rod_tags = []
+    state.finalized = False
+    state.has_run = False
+
+
+async def _add_rod(
+    session: ClientSession, recorder: _Recorder, state: _ClientState, max_rods: int
+) -> None:
+    if not state.created or state.finalized or len(state.rod_tags) >= max_rods:
+        await _reset_simulator(session, recorder, state)
+    rod_tag = f"rod{len(state.rod_tags)}"
+    if await recorder.call(
+        session,
+        "create_rod",
+        {
+            "simulator_tag": state.simulator_tag,
+            "rod_tag": rod_tag,
+            "rod_params": DEFAULT_ROD_PARAMS,
+            "material": DEFAULT_MATERIAL,
+        },
+    ):
+        state.rod_tags.append(rod_tag)
+
+
+async def _run(
+    session: ClientSession,
+    recorder: _Recorder,
+    state: _ClientState,
+    config: LoadTestConfig,
+) -> None:
+    if not state.finalized:
+        if not state.rod_tags:
+            await _add_rod(session, recorder, state, config.max_rods)
+        state.finalized = await recorder.call(
+            session, "finalize_simulator", {"simulator_tag": state.simulator_tag}
+        )
+    state.has_run = await recorder.call(
+        session,
+        "run_simulation",
+        {"simulator_tag": state.simulator_tag, "run_time": config.run_time},
+    )
+
+
+async def _client(
+    server: FastMCP, client_id: int, config: LoadTestConfig, recorder: _Recorder
+) -> None:
+    rng = random.Random(config.seed + client_id)
+    operations = list(config.operation_mix)
+    weights = [config.operation_mix[name] for name in operations]
+    state = _ClientState(simulator_tag=f"loadtest-{client_id}")
+
+    async with create_connected_server_and_client_session(
+        server._mcp_server
+    ) as session:
+        for operation in rng.choices(operations, weights, k=config.n_operations):
+            if operation == "create_simulator":
+                await _reset_simulator(session, recorder, state)
+            elif operation == "create_rod":
+                await _add_rod(session, recorder, state, config.max_rods)
+            elif operation == "run_simulation":
+                await _run(session, recorder, state, config)
+            elif operation == "get_current_position":
+                if not state.has_run:
+                    await _run(session, recorder, state, config)
+                if not state.has_run or not state.rod_tags:
+                    # Setting up the simulator failed; the failure is recorded.
+                    recorder.skip(operation)
+                    continue
+                await recorder.call(
+                    session,
+                    "get_current_position",
+                    {
+                        "simulator_tag": state.simulator_tag,
+                        "rod_tag": rng.choice(state.rod_tags),
+                    },
+                )
+
+        if state.created:
+            await recorder.call(
+                session, "delete_simulator", {"simulator_tag": state.simulator_tag}
+            )
+
+
+async def run_load_test(config: LoadTestConfig) -> dict[str, Any]:
+    """
+    Drive a freshly instantiated server with concurrent simulated clients.
+
+    Args:
+        config: The load test configuration.
+
+    Returns:
+        The load test report.
+            per_tool: Latency summary of each called tool.
+            errors: Number of failed calls of each tool.
+            skipped: Number of operations skipped because their setup failed.
+            total_calls: Number of tool calls issued by all clients.
+            walltime: Wall time of the whole load test in seconds.
+            throughput: Tool calls completed per second.
+            max_rss_growth_bytes: Growth of the peak resident set size.
+    """
+    server = instantiate_server()
+    recorder = _Recorder()
+
+    rss_start = _max_rss_bytes()
+    start_time = time.perf_counter()
+    async with anyio.create_task_group() as tg:
+        for client_id in range(config.n_clients):
+            tg.start_soon(_client, server, client_id, config, recorder)
+    walltime = time.perf_counter() - start_time
+    rss_end = _max_rss_bytes()
+
+    total_calls = sum(len(samples) for samples in recorder.latencies.values())
+    return {
+        "per_tool": {
+            name: summarize_latencies(samples)
+            for name, samples in sorted(recorder.latencies.items())
+        },
+        "errors": dict(sorted(recorder.errors.items())),
+        "skipped": dict(sorted(recorder.skipped.items())),
+        "total_calls": total_calls,
+        "walltime": walltime,
+        "throughput": total_calls / walltime,
+        "max_rss_growth_bytes": rss_end - rss_start,
+    }
+
+
+def main() -> None:
+    """
+    Command line entry point of the load generator.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=LoadTestConfig.n_clients)
+    parser.add_argument("--operations", type=int, default=LoadTestConfig.n_operations)
+    parser.add_argument("--run-time", type=float, default=LoadTestConfig.run_time)
+    parser.add_argument("--max-rods", type=int, default=LoadTestConfig.max_rods)
+    parser.add_argument("--seed", type=int, default=LoadTestConfig.seed)
+    parser.add_argument(
+        "--mix",
+        type=json.loads,
+        default=None,
+        help="Operation weights as JSON, e.g. '{\"run_simulation\": 1.0}'",
+    )
+    args = parser.parse_args()
+
+    config = LoadTestConfig(
+        n_clients=args.clients,
+        n_operations=args.operations,
+        operation_mix=(
+            args.mix if args.mix is not None else dict(DEFAULT_OPERATION_MIX)
+        ),
+        run_time=args.run_time,
+        max_rods=args.max_rods,
+        seed=args.seed,
+    )
+
+    report = anyio.run(run_load_test, config)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,9 @@ import time
 
 from typing_extensions import TypedDict
 from mcp.server.fastmcp import FastMCP
+from .expression_forcing import ForcingKind
 from .manager import Manager
+from .preview import preview_simulation
 from .rod_strategy import StraightRodParams
 from ..material import MaterialParams
 
@@ -21,6 +23,25 @@ class RunResponse(TypedDict, total=True):
     walltime: float
 
 
+class BudgetedRunResponse(TypedDict, total=True):
+    last_operation_message: str
+    last_operation_success: bool
+    simulation_start_time: float
+    simulation_end_time: float
+    walltime: float
+    steps: int
+    steps_per_second: float
+
+
+class PreviewResponse(TypedDict, total=True):
+    last_operation_message: str
+    last_operation_success: bool
+    time_step: float
+    simulation_end_time: float
+    walltime: float
+    rods: dict[str, Any]
+
+
 def register_simulation_tools(mcp: FastMCP) -> None:
     manager = Manager()
 
@@ -32,6 +53,7 @@ def register_simulation_tools(mcp: FastMCP) -> None:
         """
 
         manager.create_simulation(simulator_tag)
+        manager.save_simulation(simulator_tag)
         return {
             "last_operation_message": f"Simulation created with tag {simulator_tag}",
             "last_operation_success": True,
@@ -56,6 +78,7 @@ def register_simulation_tools(mcp: FastMCP) -> None:
         Any changes to the simulation after this point will not be reflected in the results.
         """
         manager[simulator_tag].finalize()
+        manager.save_simulation(simulator_tag)
         return {
             "last_operation_message": f"Simulation finalized with tag {simulator_tag}",
             "last_operation_success": True,
@@ -80,6 +103,7 @@ def register_simulation_tools(mcp: FastMCP) -> None:
                 normal: The normal vector of the rod.
                 base_length: The length of the rod.
                 base_radius: The radius of the rod.
+                n_elem: The number of elements of the rod, between 1 and 1000. (default: 50)
             material: The material of the rod.
                 density: The density of the rod.
                 youngs_modulus: The Young's modulus of the rod.
@@ -91,6 +115,7 @@ def register_simulation_tools(mcp: FastMCP) -> None:
         manager[simulator_tag].create_rod(
             rod_tag, StraightRodParams(**rod_params), MaterialParams(**material)
         )
+        manager.save_simulation(simulator_tag)
         return {
             "last_operation_message": f"Rod created with tag {rod_tag}",
             "last_operation_success": True,
@@ -128,6 +153,7 @@ def register_simulation_tools(mcp: FastMCP) -> None:
         simulation_start_time, simulation_end_time = manager[
             simulator_tag
         ].run_simulation(run_time)
+        manager.save_simulation(simulator_tag)
 
         return RunResponse(
             last_operation_message="Simulation finished running",
@@ -137,6 +163,127 @@ def register_simulation_tools(mcp: FastMCP) -> None:
             walltime=time.time() - start_time,
         )
 
+    @mcp.tool()  # type: ignore
+    def run_simulation_with_walltime_budget(
+        simulator_tag: str, walltime_budget: float, max_run_time: float | None = None
+    ) -> BudgetedRunResponse:
+        """
+        Advance the simulation as far as possible within the given wall-clock budget.
+        Use this instead of run_simulation when the response time must be predictable.
+        The run stops at a step boundary, and the covered simulation time is reported.
+
+        Args:
+            simulator_tag: The tag of the simulator.
+            walltime_budget: The wall-clock budget in seconds.
+            max_run_time: Optional upper bound on the simulation time to advance.
+
+        Returns:
+            The response of the run simulation operation.
+                simulation_start_time: The simulation time before the run.
+                simulation_end_time: The simulation time after the run.
+                walltime: The measured wall time of the run.
+                steps: The number of time steps taken.
+                steps_per_second: The measured stepping rate.
+        """
+        (
+            simulation_start_time,
+            simulation_end_time,
+            steps,
+            walltime,
+        ) = manager[simulator_tag].run_simulation_with_walltime_budget(
+            walltime_budget, max_run_time
+        )
+        manager.save_simulation(simulator_tag)
+
+        return BudgetedRunResponse(
+            last_operation_message=f"Simulation advanced {simulation_end_time - simulation_start_time} seconds within the walltime budget",
+            last_operation_success=True,
+            simulation_start_time=simulation_start_time,
+            simulation_end_time=simulation_end_time,
+            walltime=walltime,
+            steps=steps,
+            steps_per_second=steps / walltime if walltime > 0 else 0.0,
+        )
+
+    @mcp.tool()  # type: ignore
+    def preview_simulator(
+        simulator_tag: str,
+        run_time: float,
+        coarsening_factor: float = 4.0,
+        estimate_errors: bool = False,
+    ) -> PreviewResponse:
+        """
+        Cheaply preview the simulation at a coarse rod resolution.
+        The scene is replayed from the start with n_elem divided by coarsening_factor
+        and a proportionally larger time step (the time step is kept for scenes with ground contact,
+        so their preview is only cheaper by the cost per step, about half for the default factor).
+        The simulator itself is not modified.
+        Use this to screen configurations before running them at full resolution.
+
+        Args:
+            simulator_tag: The tag of the simulator.
+            run_time: The time to run the preview.
+            coarsening_factor: The ratio between the full and the preview resolution. (default: 4)
+            estimate_errors: Whether to estimate the errors with a second, coarser run.
+                This about doubles the cost of the preview. (default: False)
+
+        Returns:
+            The response of the preview operation.
+                time_step: The time step used by the preview.
+                simulation_end_time: The simulation time reached by the preview.
+                walltime: The wall time of the preview.
+                rods: The metrics of each rod.
+                    n_elem: The number of elements used by the preview.
+                    forward_velocity: The average center-of-mass velocity along the initial rod direction.
+                    forward_velocity_error: The estimated error of forward_velocity against the full resolution, or null if not estimated or if the preview resolution is already the minimum.
+                    center_of_mass_displacement: The displacement of the center of mass.
+                    center_of_mass_displacement_error: The estimated error of the displacement against the full resolution, or null if not estimated or if the preview resolution is already the minimum.
+        """
+        start_time = time.time()
+        result = preview_simulation(
+            manager[simulator_tag], run_time, coarsening_factor, estimate_errors
+        )
+
+        return PreviewResponse(
+            last_operation_message="Preview finished running",
+            last_operation_success=True,
+            time_step=result["time_step"],
+            simulation_end_time=result["simulation_end_time"],
+            walltime=time.time() - start_time,
+            rods=result["rods"],
+        )
+
+    @mcp.tool()  # type: ignore
+    def add_expression_forcing(
+        simulator_tag: str,
+        rod_tag: str,
+        expression: tuple[str, str, str],
+        kind: ForcingKind = "force",
+    ) -> SystemResponse:
+        """
+        Apply a custom force or torque given by mathematical expressions.
+        Forces are evaluated at every node, torques at every element center (in the lab frame).
+
+        Args:
+            simulator_tag: The tag of the simulator.
+            rod_tag: The tag of the rod.
+            expression: The expressions of the x, y and z components, e.g. ["0", "0", "0.1 * sin(2 * pi * t - s)"].
+                Available variables are x, y, z (position), t (time) and s (arc-length from the rod start).
+                Available constants are pi and e.
+                Available functions are sin, cos, tan, arcsin, arccos, arctan, arctan2, sinh, cosh, tanh,
+                exp, log, sqrt, abs, sign, minimum and maximum.
+            kind: Either "force" or "torque". (default: "force")
+
+        Returns:
+            The response of the add forcing operation.
+        """
+        manager[simulator_tag].add_expression_forcing(rod_tag, expression, kind)
+        manager.save_simulation(simulator_tag)
+        return {
+            "last_operation_message": f"Expression {kind} applied to rod {rod_tag} on simulator {simulator_tag}.",
+            "last_operation_success": True,
+        }
+
     # Temporary tool
     @mcp.tool()  # type: ignore
     def apply_snake_boundary_conditions(
@@ -158,6 +305,7 @@ def register_simulation_tools(mcp: FastMCP) -> None:
         manager[simulator_tag].mimic_snake_motion(
             rod_tag, StraightRodParams(**rod_params)
         )
+        manager.save_simulation(simulator_tag)
         return {
             "last_operation_message": f"Snake boundary condition applied with tag {rod_tag} on simulator {simulator_tag}.",
             "last_operation_success": True,
@@ -0,0 +1,106 @@
+from typing import Any
+
+import elastica as ea
+import numpy as np
+from elastica.dissipation import DamperBase
+from elastica.memory_block.memory_block_rod import MemoryBlockCosseratRod
+
+from .environment import Simulator
+
+
+def _locate_rods(
+    simulator: Simulator, rods: list[ea.CosseratRod]
+) -> tuple[MemoryBlockCosseratRod, list[tuple[slice, slice]]]:
+    """
+    Find the memory block holding the rods, and the node and element range of
+    each rod inside it. Only valid once the simulator is finalized.
+    """
+    block = next(
+        block
+        for block in simulator.block_systems()
+        if isinstance(block, MemoryBlockCosseratRod)
+    )
+    block_index = {int(sys_idx): k for k, sys_idx in enumerate(block.system_idx_list)}
+
+    ranges = []
+    for rod in rods:
+        k = block_index[simulator.get_system_index(rod)]
+        node_range = slice(
+            block.start_idx_in_rod_nodes[k], block.end_idx_in_rod_nodes[k]
+        )
+        element_range = slice(
+            block.start_idx_in_rod_elems[k], block.end_idx_in_rod_elems[k]
+        )
+        ranges.append((node_range, element_range))
+    return block, ranges
+
+
+class BatchedGravityForces(ea.NoForces):
+    """
+    Gravity on a group of rods, applied as a single addition over the memory block.
+
+    The forcing is registered on one rod of the group but acts on all of them.
+    The rods list may still grow until the simulator is finalized.
+    """
+
+    def __init__(
+        self,
+        acc_gravity: np.ndarray,
+        simulator: Simulator,
+        rods: list[ea.CosseratRod],
+    ) -> None:
+        super().__init__()
+        self.block, ranges = _locate_rods(simulator, rods)
+
+        # Nodal weights are constant; ghost nodes and other rods get zero.
+        mass = np.zeros(self.block.n_nodes)
+        for node_range, _ in ranges:
+            mass[node_range] = self.block.mass[node_range]
+        self.weight = np.outer(acc_gravity, mass)
+
+    def apply_forces(self, system: Any, time: np.float64 = np.float64(0.0)) -> None:
+        self.block.external_forces += self.weight
+
+
+class BatchedAnalyticalLinearDamper(DamperBase):
+    """
+    AnalyticalLinearDamper (damping_constant protocol) on a group of rods, applied
+    as a single fused update over the memory block.
+
+    The damper is registered on one rod of the group but acts on all of them.
+    The rods list may still grow until the simulator is finalized.
+    """
+
+    def __init__(
+        self,
+        damping_constant: float,
+        time_step: float,
+        simulator: Simulator,
+        rods: list[ea.CosseratRod],
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.block, ranges = _locate_rods(simulator, rods)
+
+        # Coefficients are one for ghosts and other rods, i.e. no damping.
+        self.translational_damping_coefficient = np.ones(self.block.n_nodes)
+        self.rotational_damping_coefficient = np.ones((3, self.block.n_elems))
+        inv_moi = np.diagonal(self.block.inv_mass_second_moment_of_inertia).T
+        for node_range, element_range in ranges:
+            self.translational_damping_coefficient[node_range] = np.exp(
+                -damping_constant * time_step
+            )
+
+            nodal_mass = self.block.mass[node_range]
+            element_mass = 0.5 * (nodal_mass[1:] + nodal_mass[:-1])
+            element_mass[0] += 0.5 * nodal_mass[0]
+            element_mass[-1] += 0.5 * nodal_mass[-1]
+            self.rotational_damping_coefficient[:, element_range] = np.exp(
+                -damping_constant * time_step * element_mass * inv_moi[:, element_range]
+            )
+
+    def dampen_rates(self, system: Any, time: np.float64) -> None:
+        self.block.velocity_collection *= self.translational_damping_coefficient
+        self.block.omega_collection *= np.power(
+            self.rotational_damping_coefficient, self.block.dilatation
+        )
@@ -0,0 +1,130 @@
+from typing import Any, Callable, Concatenate, Iterator, ParamSpec, Protocol, TypeVar
+from contextlib import contextmanager
+import functools
+import threading
+
+P = ParamSpec("P")
+R = TypeVar("R")
+T = TypeVar("T")
+
+
+class ReadWriteLock:
+    """
+    Readers-writer lock. Any number of readers or a single writer may hold it.
+
+    Waiting writers block new readers, so a steady stream of reads cannot starve
+    a simulation run.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._condition:
+            while self._writer or self._waiting_writers > 0:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers > 0:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class ReadMemo:
+    """
+    Memo of read results, valid while the simulation time is unchanged.
+
+    Concurrent requests for the same entry are coalesced: only the first one
+    computes the value, and the others wait for it and reuse it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[Any, tuple[float, Any]] = {}
+        self._key_locks: dict[Any, threading.Lock] = {}
+
+    def get(self, key: Any, simulation_time: float, compute: Callable[[], T]) -> T:
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == simulation_time:
+                cached: T = entry[1]
+                return cached
+            value = compute()
+            self._entries[key] = (simulation_time, value)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class Guarded(Protocol):
+    """
+    Object whose methods can be guarded by exclusive and coalesced_read.
+    """
+
+    lock: ReadWriteLock
+    read_memo: ReadMemo
+    simulation_time: float
+
+
+G = TypeVar("G", bound=Guarded)
+
+
+def exclusive(func: Callable[Concatenate[G, P], R]) -> Callable[Concatenate[G, P], R]:
+    """
+    Decorator to run a SimulationInstance method under the write lock.
+    The read memo is invalidated, since the method may modify the simulation.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self: G, *args: P.args, **kwargs: P.kwargs) -> R:
+        with self.lock.write():
+            self.read_memo.clear()
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def coalesced_read(
+    func: Callable[Concatenate[G, P], R],
+) -> Callable[Concatenate[G, P], R]:
+    """
+    Decorator to run a SimulationInstance method under the read lock, serving
+    repeated calls at the same simulation time from the read memo.
+    The memoized value is shared between callers and must not be modified.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self: G, *args: P.args, **kwargs: P.kwargs) -> R:
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        with self.lock.read():
+            return self.read_memo.get(
+                key, self.simulation_time, lambda: func(self, *args, **kwargs)
+            )
+
+    return wrapper
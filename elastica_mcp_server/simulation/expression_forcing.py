@@ -0,0 +1,242 @@
+from typing import Any, Callable, Literal, TypeAlias
+import ast
+import hashlib
+import threading
+
+import elastica as ea
+import numpy as np
+
+ForcingKind: TypeAlias = Literal["force", "torque"]
+ExpressionKernel: TypeAlias = Callable[..., np.ndarray]
+
+# Names available inside an expression.
+EXPRESSION_VARIABLES = ("x", "y", "z", "t", "s")
+EXPRESSION_CONSTANTS: dict[str, float] = {"pi": np.pi, "e": np.e}
+EXPRESSION_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "arcsin": np.arcsin,
+    "arccos": np.arccos,
+    "arctan": np.arctan,
+    "arctan2": np.arctan2,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "exp": np.exp,
+    "log": np.log,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "sign": np.sign,
+    "minimum": np.minimum,
+    "maximum": np.maximum,
+}
+# Number of arguments of each function. Extra positional arguments of numpy
+# ufuncs are output arrays, so they must be rejected.
+EXPRESSION_FUNCTION_ARITY: dict[str, int] = {
+    name: 2 if name in ("arctan2", "minimum", "maximum") else 1
+    for name in EXPRESSION_FUNCTIONS
+}
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Pow,
+    ast.Mod,
+    ast.UAdd,
+    ast.USub,
+)
+
+# Compiled kernels, keyed by the hash of the parsed expressions.
+EXPRESSION_KERNEL_CACHE_SIZE = 256
+_kernel_cache: dict[str, ExpressionKernel] = {}
+_kernel_cache_lock = threading.Lock()
+
+
+def parse_expression(expression: str) -> ast.Expression:
+    """
+    Parse an expression and reject anything but arithmetic on the allowed names.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {expression!r}: {e.msg}") from e
+
+    called_names = {
+        id(node.func) for node in ast.walk(tree) if isinstance(node, ast.Call)
+    }
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(
+                f"Invalid expression {expression!r}: {type(node).__name__} is not allowed"
+            )
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise ValueError(
+                    f"Invalid expression {expression!r}: only numeric constants are allowed"
+                )
+            # Evaluate in floating point, so that e.g. 9**9**9 raises an
+            # OverflowError instead of building an arbitrarily large integer.
+            node.value = float(node.value)
+        if isinstance(node, ast.Call) and (
+            not isinstance(node.func, ast.Name)
+            or node.func.id not in EXPRESSION_FUNCTIONS
+            or node.keywords
+        ):
+            raise ValueError(
+                f"Invalid expression {expression!r}: allowed functions are {sorted(EXPRESSION_FUNCTIONS)}"
+            )
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            arity = EXPRESSION_FUNCTION_ARITY[node.func.id]
+            if len(node.args) != arity:
+                raise ValueError(
+                    f"Invalid expression {expression!r}: {node.func.id} takes {arity} argument(s), got {len(node.args)}"
+                )
+        if (
+            isinstance(node, ast.Name)
+            and node.id in EXPRESSION_FUNCTIONS
+            and id(node) not in called_names
+        ):
+            raise ValueError(
+                f"Invalid expression {expression!r}: function {node.id!r} must be called"
+            )
+        if isinstance(node, ast.Name) and not (
+            node.id in EXPRESSION_VARIABLES
+            or node.id in EXPRESSION_CONSTANTS
+            or node.id in EXPRESSION_FUNCTIONS
+        ):
+            raise ValueError(
+                f"Invalid expression {expression!r}: unknown name {node.id!r}, allowed variables are {EXPRESSION_VARIABLES}"
+            )
+    return tree
+
+
+def compile_expression(expression: tuple[str, str, str]) -> ExpressionKernel:
+    """
+    Compile the three components of a vector expression into a vectorized kernel.
+
+    The kernel is called as kernel(x, y, z, t, s) with node-wise arrays x, y, z
+    and s and a scalar t, and returns an array of shape (3, n). Kernels are
+    cached by the hash of the parsed expressions, so equivalent expressions that
+    differ only in formatting are compiled once.
+
+    Args:
+        expression: Expressions of the x, y and z components.
+
+    Returns:
+        The compiled kernel.
+    """
+    if len(expression) != 3:
+        raise ValueError(
+            f"Expression must have three components, got {len(expression)}"
+        )
+    trees = [parse_expression(component) for component in expression]
+    key = hashlib.sha256(
+        "\n".join(ast.dump(tree) for tree in trees).encode("utf-8")
+    ).hexdigest()
+    with _kernel_cache_lock:
+        if key in _kernel_cache:
+            return _kernel_cache[key]
+
+    codes = [compile(tree, "<expression>", "eval") for tree in trees]
+    namespace: dict[str, Any] = {
+        "__builtins__": {},
+        **EXPRESSION_CONSTANTS,
+        **EXPRESSION_FUNCTIONS,
+    }
+
+    def kernel(
+        x: np.ndarray, y: np.ndarray, z: np.ndarray, t: float, s: np.ndarray
+    ) -> np.ndarray:
+        # Read-only views, so that an expression cannot write into the rod.
+        variables: dict[str, Any] = {"t": t}
+        for name, value in (("x", x), ("y", y), ("z", z), ("s", s)):
+            view = value.view()
+            view.flags.writeable = False
+            variables[name] = view
+        result = np.empty((3, s.shape[0]))
+        for i, code in enumerate(codes):
+            result[i] = eval(code, namespace, variables)  # noqa: S307
+        return result
+
+    with _kernel_cache_lock:
+        if len(_kernel_cache) >= EXPRESSION_KERNEL_CACHE_SIZE:
+            # Evict the oldest kernel.
+            del _kernel_cache[next(iter(_kernel_cache))]
+        _kernel_cache[key] = kernel
+    return kernel
+
+
+class ExpressionForces(ea.NoForces):
+    """
+    Forcing defined by a vector expression in position, time and arc-length.
+
+    Forces are evaluated at the nodes and torques at the element centers. Torques
+    are given in the lab frame and rotated into the material frame of each element.
+    """
+
+    def __init__(
+        self,
+        expression: tuple[str, str, str],
+        kind: ForcingKind,
+        rest_lengths: np.ndarray,
+    ) -> None:
+        super().__init__()
+        self.kernel = compile_expression(expression)
+        self.kind = kind
+
+        node_arc_length = np.concatenate(([0.0], np.cumsum(rest_lengths)))
+        self.node_arc_length = node_arc_length
+        self.element_arc_length = 0.5 * (node_arc_length[1:] + node_arc_length[:-1])
+
+        self.expression = expression
+
+    def _evaluate(self, system: Any, time: float | np.float64) -> np.ndarray:
+        # Forces at the nodes, torques at the element centers.
+        if self.kind == "force":
+            position = system.position_collection
+            arc_length = self.node_arc_length
+        else:
+            position = 0.5 * (
+                system.position_collection[:, 1:] + system.position_collection[:, :-1]
+            )
+            arc_length = self.element_arc_length
+        return self.kernel(position[0], position[1], position[2], time, arc_length)
+
+    def check(self, system: Any) -> None:
+        """
+        Evaluate the expression once on the current state of the system, and raise
+        a ValueError if that fails or gives non-finite values.
+        """
+        try:
+            with np.errstate(all="raise"):
+                value = self._evaluate(system, 0.0)
+        except ArithmeticError as e:
+            raise ValueError(
+                f"Expression {self.expression} cannot be evaluated on the rod: {e}"
+            ) from e
+        if not np.all(np.isfinite(value)):
+            raise ValueError(
+                f"Expression {self.expression} gives non-finite values on the rod"
+            )
+
+    def apply_forces(self, system: Any, time: np.float64 = np.float64(0.0)) -> None:
+        if self.kind != "force":
+            return
+        system.external_forces += self._evaluate(system, time)
+
+    def apply_torques(self, system: Any, time: np.float64 = np.float64(0.0)) -> None:
+        if self.kind != "torque":
+            return
+        system.external_torques += np.einsum(
+            "ijk,jk->ik", system.director_collection, self._evaluate(system, time)
+        )
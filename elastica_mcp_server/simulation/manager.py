@@ -1,4 +1,7 @@
 from typing import Any, Callable
+import os
+import threading
+import time
 
 import elastica as ea
 import numpy as np
@@ -10,7 +13,24 @@ from .environment import (
     BuildResponse,
     compute_projected_velocity,
 )
+from .batched_operators import BatchedAnalyticalLinearDamper, BatchedGravityForces
+from .concurrency import ReadMemo, ReadWriteLock, coalesced_read, exclusive
+from .expression_forcing import ExpressionForces, ForcingKind
 from .rod_strategy import StraightRodParams, create_straight_rod
+from .session_store import SESSION_DIR_ENV, SessionStore, StoredSamples
+
+# Maximum number of simulations held by the Manager at the same time.
+MAX_SIMULATION_COUNT = 10
+
+# Rod state arrays that change during the simulation and must be persisted.
+ROD_STATE_FIELDS = (
+    "position_collection",
+    "velocity_collection",
+    "director_collection",
+    "omega_collection",
+    "acceleration_collection",
+    "alpha_collection",
+)
 
 
 def only_allow_once(func: Callable) -> Callable:
@@ -42,19 +62,41 @@ class SimulationInstance:
         self.simulator = Simulator()
         self.timestepper = ea.PositionVerlet()
         self.rods: dict[str, ea.CosseratRod] = {}
-        self.callbacks: dict[str, dict[str, list[Any]]] = {}
+        self.callbacks: dict[str, dict[str, list[Any] | StoredSamples]] = {}
         self.time_step = 1e-4
         self.rendering_fps = 60
         self.simulation_time = 0.0
+        self.finalized = False
+
+        # Replayable record of the operations that built the scene.
+        self.scene_spec: list[dict[str, Any]] = []
+
+        # Runs and scene changes are exclusive; reads share the lock and are
+        # memoized until the simulation time changes.
+        self.lock = ReadWriteLock()
+        self.read_memo = ReadMemo()
+
+        # Description of the diagnostics already written to the session store,
+        # per rod and key: dtype, sample shape and number of samples.
+        self.stored_diagnostics: dict[str, dict[str, dict[str, Any]]] = {}
+
+        # Rods sharing gravity or damping constants are updated by one batched
+        # operator per group, keyed by the constants.
+        self.gravity_groups: dict[tuple[float, float, float], list[ea.CosseratRod]] = {}
+        self.damping_groups: dict[float, list[ea.CosseratRod]] = {}
 
     @property
     def step_skip(self) -> int:
         return int(1.0 / (self.rendering_fps * self.time_step))
 
+    @exclusive
     @only_allow_once
     def finalize(self) -> None:
         self.simulator.finalize()
+        self.finalized = True
+        self.scene_spec.append({"operation": "finalize"})
 
+    @exclusive
     def create_rod(
         self, rod_tag: str, rod_params: StraightRodParams, material: MaterialParams
     ) -> BuildResponse:
@@ -66,46 +108,120 @@ class SimulationInstance:
 
         # Add gravity to the rod
         gravitational_acc = -9.80665
-        self.simulator.add_forcing_to(rod).using(
-            ea.GravityForces, acc_gravity=np.array([0.0, gravitational_acc, 0.0])
-        )
+        self._add_gravity(rod, (0.0, gravitational_acc, 0.0))
 
         # Add damping
         damping_constant = 2e-3
-        self.simulator.dampen(rod).using(
-            ea.AnalyticalLinearDamper,
-            damping_constant=damping_constant,
-            time_step=self.time_step,
-        )
+        self._add_damping(rod, damping_constant)
 
         # Collect diagnostics
-        pp_list: dict[str, list[Any]] = ea.defaultdict(list)
+        pp_list: dict[str, list[Any] | StoredSamples] = ea.defaultdict(list)
         self.simulator.collect_diagnostics(rod).using(
             RodCallBack, step_skip=self.step_skip, callback_params=pp_list
         )
         self.callbacks[rod_tag] = pp_list
 
+        self.scene_spec.append(
+            {
+                "operation": "create_rod",
+                "rod_tag": rod_tag,
+                "rod_params": rod_params.model_dump(),
+                "material": material.model_dump(),
+            }
+        )
+
         return BuildResponse(
             last_operation_message="Rod created", last_operation_success=status
         )
 
+    def _add_gravity(
+        self, rod: ea.CosseratRod, acc_gravity: tuple[float, float, float]
+    ) -> None:
+        # The batched operator is registered with the first rod of the group and
+        # picks up the rods added later when the simulator is finalized.
+        if acc_gravity not in self.gravity_groups:
+            self.gravity_groups[acc_gravity] = []
+            self.simulator.add_forcing_to(rod).using(
+                BatchedGravityForces,
+                acc_gravity=np.array(acc_gravity),
+                simulator=self.simulator,
+                rods=self.gravity_groups[acc_gravity],
+            )
+        self.gravity_groups[acc_gravity].append(rod)
+
+    def _add_damping(self, rod: ea.CosseratRod, damping_constant: float) -> None:
+        if damping_constant not in self.damping_groups:
+            self.damping_groups[damping_constant] = []
+            self.simulator.dampen(rod).using(
+                BatchedAnalyticalLinearDamper,
+                damping_constant=damping_constant,
+                time_step=self.time_step,
+                simulator=self.simulator,
+                rods=self.damping_groups[damping_constant],
+            )
+        self.damping_groups[damping_constant].append(rod)
+
+    def _step(self) -> None:
+        self.simulation_time = float(
+            self.timestepper.step(
+                self.simulator,
+                np.float64(self.simulation_time),
+                np.float64(self.time_step),
+            )
+        )
+
+    @exclusive
     def run_simulation(self, run_time: float) -> tuple[float, float]:
         simulation_start_time = self.simulation_time
         for _ in range(int(run_time / self.time_step)):
-            self.simulation_time = float(
-                self.timestepper.step(
-                    self.simulator,
-                    np.float64(self.simulation_time),
-                    np.float64(self.time_step),
-                )
-            )
+            self._step()
 
         return simulation_start_time, self.simulation_time
 
+    @exclusive
+    def run_simulation_with_walltime_budget(
+        self, walltime_budget: float, max_run_time: float | None = None
+    ) -> tuple[float, float, int, float]:
+        """
+        Advance the simulation as far as possible within the given wall-clock budget.
+
+        The budget is checked between steps, so the run always stops at a step
+        boundary. The step that crosses the budget is completed, hence the
+        measured walltime can exceed the budget by at most one step.
+
+        Args:
+            walltime_budget: Wall-clock budget in seconds.
+            max_run_time: Optional upper bound on the simulated time to advance.
+
+        Returns:
+            Simulation start time, simulation end time, number of steps taken and
+            measured walltime.
+        """
+        simulation_start_time = self.simulation_time
+        max_steps = None if max_run_time is None else int(max_run_time / self.time_step)
+
+        n_steps = 0
+        start_time = time.perf_counter()
+        deadline = start_time + walltime_budget
+        while time.perf_counter() < deadline:
+            if max_steps is not None and n_steps >= max_steps:
+                break
+            self._step()
+            n_steps += 1
+
+        return (
+            simulation_start_time,
+            self.simulation_time,
+            n_steps,
+            time.perf_counter() - start_time,
+        )
+
+    @coalesced_read
     def get_current_position(self, rod_tag: str) -> list[list[float]]:
         data_dict = self.callbacks[rod_tag]
         return data_dict["position"][-1].tolist()
 
+    @exclusive
     @only_allow_once
     def mimic_snake_motion(self, rod_tag: str, rod_params: StraightRodParams) -> None:
         wave_length = 1.0
@@ -154,6 +270,49 @@ class SimulationInstance:
             kinetic_mu_array=kinetic_mu_array,
         )
 
+        self.scene_spec.append(
+            {
+                "operation": "mimic_snake_motion",
+                "rod_tag": rod_tag,
+                "rod_params": rod_params.model_dump(),
+            }
+        )
+
+    @exclusive
+    def add_expression_forcing(
+        self, rod_tag: str, expression: tuple[str, str, str], kind: ForcingKind
+    ) -> None:
+        if self.finalized:
+            raise ValueError(
+                f"Cannot add forcing to simulator {self.simulator_tag} after it is finalized. If you need to modify the simulator contents, please delete the simulator and recreate it."
+            )
+
+        # Evaluate once now to report invalid expressions before finalize. The
+        # kernel is cached, so the forcing instance reuses it.
+        rod = self.rods[rod_tag]
+        ExpressionForces(
+            expression=expression,
+            kind=kind,
+            rest_lengths=rod.rest_lengths,
+        ).check(rod)
+
+        self.simulator.add_forcing_to(rod).using(
+            ExpressionForces,
+            expression=tuple(expression),
+            kind=kind,
+            rest_lengths=rod.rest_lengths.copy(),
+        )
+
+        self.scene_spec.append(
+            {
+                "operation": "add_expression_forcing",
+                "rod_tag": rod_tag,
+                "expression": list(expression),
+                "kind": kind,
+            }
+        )
+
+    @coalesced_read
     def get_velocity(self, rod_tag: str) -> dict[str, list[float]]:
         data_dict = self.callbacks[rod_tag]
         period = 2
@@ -163,33 +322,184 @@ class SimulationInstance:
             "average_lateral_velocity": avg_lateral.tolist(),
         }
 
+    def replay_scene_spec(self, scene_spec: list[dict[str, Any]]) -> None:
+        """
+        Rebuild the scene by replaying the recorded operations.
+        """
+        for entry in scene_spec:
+            operation = entry["operation"]
+            if operation == "create_rod":
+                self.create_rod(
+                    entry["rod_tag"],
+                    StraightRodParams(**entry["rod_params"]),
+                    MaterialParams(**entry["material"]),
+                )
+            elif operation == "mimic_snake_motion":
+                self.mimic_snake_motion(
+                    entry["rod_tag"], StraightRodParams(**entry["rod_params"])
+                )
+            elif operation == "add_expression_forcing":
+                self.add_expression_forcing(
+                    entry["rod_tag"], tuple(entry["expression"]), entry["kind"]
+                )
+            elif operation == "finalize":
+                self.finalize()
+            else:
+                raise ValueError(f"Invalid scene operation: {operation}")
+
+    def save_session(self, session_store: SessionStore) -> None:
+        """
+        Write the scene, rod states and diagnostics to the session store.
+        """
+        # Hold the write lock: the state must not change while it is written,
+        # and concurrent saves of the same session would race on the files.
+        with self.lock.write():
+            rod_tags = list(self.rods)
+            arrays: dict[str, np.ndarray] = {}
+            for index, rod_tag in enumerate(rod_tags):
+                rod = self.rods[rod_tag]
+                for field in ROD_STATE_FIELDS:
+                    arrays[f"rod{index}_{field}"] = np.asarray(getattr(rod, field))
+
+                # Diagnostics are append-only: write the new samples only.
+                stored = self.stored_diagnostics.setdefault(rod_tag, {})
+                for key, values in self.callbacks[rod_tag].items():
+                    stored_count = stored[key]["count"] if key in stored else 0
+                    if len(values) == stored_count:
+                        continue
+                    samples = np.asarray(values[stored_count:])
+                    session_store.append_samples(
+                        self.simulator_tag,
+                        f"rod{index}_diagnostics_{key}",
+                        samples,
+                        stored_count,
+                    )
+                    stored[key] = {
+                        "dtype": samples.dtype.str,
+                        "sample_shape": list(samples.shape[1:]),
+                        "count": len(values),
+                    }
+
+            manifest = {
+                "time_step": self.time_step,
+                "rendering_fps": self.rendering_fps,
+                "simulation_time": self.simulation_time,
+                "scene_spec": self.scene_spec,
+                "rod_tags": rod_tags,
+                "diagnostics": self.stored_diagnostics,
+            }
+            session_store.save(self.simulator_tag, manifest, arrays)
+
+    @classmethod
+    def load_session(
+        cls, session_store: SessionStore, simulator_tag: str
+    ) -> "SimulationInstance":
+        """
+        Restore a simulation instance from the session store.
+
+        The scene is rebuilt from the recorded operations, after which the rod
+        states are overwritten with the stored arrays. Diagnostics are restored
+        as memory-mapped arrays, so the cost does not depend on their length.
+        """
+        manifest = session_store.load_manifest(simulator_tag)
+
+        instance = cls(simulator_tag)
+        instance.time_step = manifest["time_step"]
+        instance.rendering_fps = manifest["rendering_fps"]
+        instance.replay_scene_spec(manifest["scene_spec"])
+        instance.simulation_time = manifest["simulation_time"]
+
+        for index, rod_tag in enumerate(manifest["rod_tags"]):
+            rod = instance.rods[rod_tag]
+            for field in ROD_STATE_FIELDS:
+                # Assign in place: after finalize, rod arrays are views into
+                # the simulator memory block.
+                getattr(rod, field)[...] = session_store.load_array(
+                    simulator_tag, f"rod{index}_{field}", manifest["generation"]
+                )
+            # Finalizing the replayed scene records an initial sample; the
+            # stored diagnostics already contain it.
+            instance.callbacks[rod_tag].clear()
+            for key, stored in manifest["diagnostics"].get(rod_tag, {}).items():
+                instance.callbacks[rod_tag][key] = StoredSamples(
+                    session_store.load_samples(
+                        simulator_tag,
+                        f"rod{index}_diagnostics_{key}",
+                        stored["dtype"],
+                        stored["sample_shape"],
+                        stored["count"],
+                    )
+                )
+        instance.stored_diagnostics = manifest["diagnostics"]
+
+        return instance
+
 
 # Singleton class to manage multiple simulation instances
 class Manager:
-    def __new__(cls) -> "Manager":
+    def __new__(cls, *args: Any, **kwargs: Any) -> "Manager":
         if not hasattr(cls, "instance"):
             cls.instance = super(Manager, cls).__new__(cls)
         return cls.instance
 
-    def __init__(self) -> None:
+    def __init__(self, session_store: SessionStore | None = None) -> None:
         self.simulations = {}
         self.simulation_counter = 0
+        self._lock = threading.Lock()
 
         # TODO: use multithreading later ot run multiple instances
-        self._max_simulation_count = 10
+        self._max_simulation_count = MAX_SIMULATION_COUNT
 
-    def create_simulation(self, simulator_tag: str) -> None:
+        # Sessions are persisted only if a store is given or configured.
+        if session_store is None and os.environ.get(SESSION_DIR_ENV):
+            session_store = SessionStore(os.environ[SESSION_DIR_ENV])
+        self.session_store = session_store
+
+    def _check_simulation_count(self) -> None:
         if self.simulation_counter >= self._max_simulation_count:
             raise ValueError(
                 "Maximum number of simulations reached. Please delete some simulations before creating a new one."
             )
-        self.simulations[simulator_tag] = SimulationInstance(simulator_tag)
-        self.simulation_counter += 1
+
+    def create_simulation(self, simulator_tag: str) -> None:
+        with self._lock:
+            # Stored sessions count as existing, even before they are restored.
+            if simulator_tag in self.simulations or (
+                self.session_store is not None and simulator_tag in self.session_store
+            ):
+                raise ValueError(
+                    f"Simulation with tag {simulator_tag} already exists. Please delete it or use a different tag."
+                )
+            self._check_simulation_count()
+            self.simulations[simulator_tag] = SimulationInstance(simulator_tag)
+            self.simulation_counter += 1
 
     def delete_simulation(self, simulator_tag: str) -> None:
-        if simulator_tag in self.simulations:
-            del self.simulations[simulator_tag]
-            self.simulation_counter -= 1
+        with self._lock:
+            if simulator_tag in self.simulations:
+                del self.simulations[simulator_tag]
+                self.simulation_counter -= 1
+            if self.session_store is not None:
+                self.session_store.delete(simulator_tag)
+
+    def save_simulation(self, simulator_tag: str) -> None:
+        """
+        Persist the simulation if a session store is configured.
+        """
+        if self.session_store is not None:
+            self[simulator_tag].save_session(self.session_store)
 
     def __getitem__(self, simulator_tag: str) -> SimulationInstance:
-        return self.simulations[simulator_tag]
+        with self._lock:
+            # Stored sessions are restored lazily, on first access.
+            if (
+                simulator_tag not in self.simulations
+                and self.session_store is not None
+                and simulator_tag in self.session_store
+            ):
+                self._check_simulation_count()
+                self.simulations[simulator_tag] = SimulationInstance.load_session(
+                    self.session_store, simulator_tag
+                )
+                self.simulation_counter += 1
+            return self.simulations[simulator_tag]
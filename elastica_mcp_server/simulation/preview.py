@@ -0,0 +1,223 @@
+from typing import Any
+import copy
+
+import numpy as np
+
+from .manager import SimulationInstance
+
+# Coarse rods below this resolution no longer resemble the fine model.
+MIN_PREVIEW_N_ELEM = 5
+
+# Operations that add ground contact. The contact and friction response, not the
+# element length, limits the stable time step of such scenes.
+CONTACT_OPERATIONS = ("mimic_snake_motion",)
+
+
+def coarsen_scene_spec(
+    scene_spec: list[dict[str, Any]], coarsening_factor: float
+) -> list[dict[str, Any]]:
+    """
+    Copy a scene spec with the resolution of every rod divided by the given factor.
+
+    Coarse rods keep at least MIN_PREVIEW_N_ELEM elements, but never more than
+    the original rod. The returned spec always ends with a finalize operation.
+    """
+    coarse_spec = copy.deepcopy(scene_spec)
+    for entry in coarse_spec:
+        if "rod_params" in entry:
+            n_elem = entry["rod_params"]["n_elem"]
+            entry["rod_params"]["n_elem"] = min(
+                max(int(round(n_elem / coarsening_factor)), MIN_PREVIEW_N_ELEM),
+                n_elem,
+            )
+    if not any(entry["operation"] == "finalize" for entry in coarse_spec):
+        coarse_spec.append({"operation": "finalize"})
+    return coarse_spec
+
+
+def estimate_error(
+    value: np.ndarray | float,
+    reference_value: np.ndarray | float,
+    n_elem: int,
+    reference_n_elem: int,
+) -> float | None:
+    """
+    Estimate the discretization error of a value from a coarser reference run.
+
+    Assuming first-order convergence in the element length h, the error of the
+    value is |value - reference_value| * h / (h_reference - h). Returns None if
+    the reference is not coarser.
+    """
+    if reference_n_elem >= n_elem:
+        return None
+    # h / (h_reference - h), with h proportional to 1 / n_elem.
+    scale = reference_n_elem / (n_elem - reference_n_elem)
+    return float(np.linalg.norm(np.subtract(value, reference_value))) * scale
+
+
+def _run_at_resolution(
+    simulator_tag: str,
+    scene_spec: list[dict[str, Any]],
+    time_step: float,
+    rendering_fps: int,
+    run_time: float,
+    coarsening_factor: float,
+) -> tuple[SimulationInstance, float, dict[str, np.ndarray]]:
+    coarse_spec = coarsen_scene_spec(scene_spec, coarsening_factor)
+
+    # Scale the time step with the element length, i.e. keep dt / dx constant.
+    n_elem_ratios = [
+        fine["rod_params"]["n_elem"] / coarse["rod_params"]["n_elem"]
+        for fine, coarse in zip(scene_spec, coarse_spec)
+        if fine["operation"] == "create_rod"
+    ]
+    time_step_scale = min(n_elem_ratios, default=1.0)
+    if any(entry["operation"] in CONTACT_OPERATIONS for entry in coarse_spec):
+        time_step_scale = 1.0
+
+    preview = SimulationInstance(f"{simulator_tag}-preview")
+    preview.time_step = time_step * time_step_scale
+    preview.rendering_fps = rendering_fps
+    preview.replay_scene_spec(coarse_spec)
+    initial_center_of_mass = {
+        rod_tag: rod.compute_position_center_of_mass()
+        for rod_tag, rod in preview.rods.items()
+    }
+    preview.run_simulation(run_time)
+    return preview, time_step_scale, initial_center_of_mass
+
+
+def _rod_metrics(
+    preview: SimulationInstance,
+    rod_tag: str,
+    initial_center_of_mass: np.ndarray,
+    direction: np.ndarray,
+) -> dict[str, Any]:
+    # Use the state at the end of the run, not the last diagnostic sample:
+    # runs with different time steps record samples at different times.
+    elapsed = preview.simulation_time
+    displacement = (
+        preview.rods[rod_tag].compute_position_center_of_mass() - initial_center_of_mass
+    )
+    average_velocity = displacement / elapsed if elapsed > 0 else displacement * 0.0
+    return {
+        "center_of_mass_displacement": displacement,
+        "forward_velocity": float(average_velocity @ direction),
+    }
+
+
+def preview_simulation(
+    instance: SimulationInstance,
+    run_time: float,
+    coarsening_factor: float = 4.0,
+    estimate_errors: bool = False,
+) -> dict[str, Any]:
+    """
+    Run the scene of a simulation instance at reduced resolution.
+
+    The scene is replayed from the start at resolution n_elem / coarsening_factor
+    with a proportionally larger time step. Scenes with ground contact keep the
+    original time step, since contact limits its stable value; their preview is
+    cheaper only by the cost per step, so estimate_errors, which doubles the
+    cost, is off by default.
+
+    With estimate_errors, the scene is also run at half of the preview
+    resolution. Assuming first-order convergence in the element length, the
+    difference between both runs, scaled by the actual resolutions, approximates
+    the error of the preview against the fine model. Errors are None if they are
+    not estimated, or if the reference run cannot be coarser because of
+    MIN_PREVIEW_N_ELEM.
+
+    Args:
+        instance: The simulation instance whose scene is previewed.
+        run_time: The simulation time to run the preview.
+        coarsening_factor: Ratio between the fine and the preview resolution.
+        estimate_errors: Whether to run the reference to estimate the errors.
+
+    Returns:
+        Preview time step and end time, and per-rod resolution and metrics with
+        their estimated errors.
+    """
+    if coarsening_factor < 1.0:
+        raise ValueError(
+            f"Coarsening factor must be at least 1, got {coarsening_factor}"
+        )
+    # Copy the scene under the read lock; the runs below only use the copy.
+    with instance.lock.read():
+        scene_spec = copy.deepcopy(instance.scene_spec)
+        time_step = instance.time_step
+        rendering_fps = instance.rendering_fps
+
+    rod_directions = {
+        entry["rod_tag"]: np.array(entry["rod_params"]["direction"], dtype=np.float64)
+        for entry in scene_spec
+        if entry["operation"] == "create_rod"
+    }
+    if not rod_directions:
+        raise ValueError(f"Simulation {instance.simulator_tag} has no rods to preview.")
+
+    preview, time_step_scale, initial_center_of_mass = _run_at_resolution(
+        instance.simulator_tag,
+        scene_spec,
+        time_step,
+        rendering_fps,
+        run_time,
+        coarsening_factor,
+    )
+    reference = None
+    if estimate_errors:
+        reference, _, reference_initial_center_of_mass = _run_at_resolution(
+            instance.simulator_tag,
+            scene_spec,
+            time_step,
+            rendering_fps,
+            run_time,
+            2.0 * coarsening_factor,
+        )
+
+    rods: dict[str, Any] = {}
+    for rod_tag, direction in rod_directions.items():
+        metrics = _rod_metrics(
+            preview, rod_tag, initial_center_of_mass[rod_tag], direction
+        )
+        n_elem = preview.rods[rod_tag].n_elems
+
+        forward_velocity_error: float | None = None
+        center_of_mass_displacement_error: float | None = None
+        if reference is not None:
+            reference_metrics = _rod_metrics(
+                reference,
+                rod_tag,
+                reference_initial_center_of_mass[rod_tag],
+                direction,
+            )
+            reference_n_elem = reference.rods[rod_tag].n_elems
+            forward_velocity_error = estimate_error(
+                metrics["forward_velocity"],
+                reference_metrics["forward_velocity"],
+                n_elem,
+                reference_n_elem,
+            )
+            center_of_mass_displacement_error = estimate_error(
+                metrics["center_of_mass_displacement"],
+                reference_metrics["center_of_mass_displacement"],
+                n_elem,
+                reference_n_elem,
+            )
+
+        rods[rod_tag] = {
+            "n_elem": n_elem,
+            "forward_velocity": metrics["forward_velocity"],
+            "forward_velocity_error": forward_velocity_error,
+            "center_of_mass_displacement": metrics[
+                "center_of_mass_displacement"
+            ].tolist(),
+            "center_of_mass_displacement_error": center_of_mass_displacement_error,
+        }
+
+    return {
+        "time_step": preview.time_step,
+        "time_step_scale": time_step_scale,
+        "simulation_end_time": preview.simulation_time,
+        "rods": rods,
+    }
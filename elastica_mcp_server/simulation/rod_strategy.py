@@ -1,10 +1,16 @@
+import copy
+import threading
+
 import numpy as np
 
 import elastica as ea
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from ..material import MaterialParams
 
+# Upper bound on the rod resolution accepted from users.
+MAX_N_ELEM = 1000
+
 
 class StraightRodParams(BaseModel):
     """
@@ -19,27 +25,145 @@ class StraightRodParams(BaseModel):
     base_length: float  # Should be positive
     base_radius: float  # Should be positive
 
-    n_elem: int = 50  # Fix to 50
+    n_elem: int = Field(default=50, gt=0, le=MAX_N_ELEM)  # Number of elements
 
 
-def create_straight_rod(
-    rod_params: StraightRodParams,
+# Straight rods are built once per geometry and stiffness in this canonical
+# pose and density, then copied and transformed.
+_TEMPLATE_DIRECTION = np.array([0.0, 0.0, 1.0])
+_TEMPLATE_NORMAL = np.array([0.0, 1.0, 0.0])
+ROD_TEMPLATE_CACHE_SIZE = 64
+
+# Rod attributes that are vectors or frames in the lab frame.
+_LAB_FRAME_VECTOR_FIELDS = ("position_collection", "tangents")
+# Rod attributes proportional to the density (and their inverses).
+_DENSITY_FIELDS = ("density", "mass", "mass_second_moment_of_inertia")
+_INVERSE_DENSITY_FIELDS = ("inv_mass_second_moment_of_inertia",)
+
+_rod_template_cache: dict[tuple[float, ...], tuple[float, ea.CosseratRod]] = {}
+_rod_template_cache_lock = threading.Lock()
+
+
+def _build_straight_rod(
+    n_elem: int,
+    start_position: np.ndarray,
+    direction: np.ndarray,
+    normal: np.ndarray,
+    base_length: float,
+    base_radius: float,
     material: MaterialParams,
 ) -> ea.CosseratRod:
-    """
-    Create a straight Cosserat rod with specified parameters.
-    """
-
     shear_modulus = material.youngs_modulus / (1 + material.poisson_ratio)
 
     return ea.CosseratRod.straight_rod(
+        n_elem,
+        start_position,
+        direction,
+        normal,
+        base_length,
+        base_radius,
+        material.density,
+        youngs_modulus=material.youngs_modulus,
+        shear_modulus=shear_modulus,
+    )
+
+
+def _copy_rod(rod: ea.CosseratRod) -> ea.CosseratRod:
+    rod_copy = copy.copy(rod)
+    for name, value in vars(rod_copy).items():
+        if isinstance(value, np.ndarray):
+            setattr(rod_copy, name, value.copy())
+    return rod_copy
+
+
+def _get_rod_template(
+    rod_params: StraightRodParams, material: MaterialParams
+) -> tuple[float, ea.CosseratRod]:
+    key = (
         rod_params.n_elem,
-        np.array(rod_params.start_position, dtype=np.float64),
-        np.array(rod_params.direction, dtype=np.float64),
-        np.array(rod_params.normal, dtype=np.float64),
         rod_params.base_length,
         rod_params.base_radius,
+        material.youngs_modulus,
+        material.poisson_ratio,
+    )
+    with _rod_template_cache_lock:
+        if key in _rod_template_cache:
+            return _rod_template_cache[key]
+
+    # Build outside the lock, so that other geometries are not blocked.
+    template = (
         material.density,
-        youngs_modulus=material.youngs_modulus,
-        shear_modulus=shear_modulus,
+        _build_straight_rod(
+            rod_params.n_elem,
+            np.zeros(3),
+            _TEMPLATE_DIRECTION.copy(),
+            _TEMPLATE_NORMAL.copy(),
+            rod_params.base_length,
+            rod_params.base_radius,
+            material,
+        ),
+    )
+    with _rod_template_cache_lock:
+        if key not in _rod_template_cache:
+            if len(_rod_template_cache) >= ROD_TEMPLATE_CACHE_SIZE:
+                # Evict the oldest template.
+                del _rod_template_cache[next(iter(_rod_template_cache))]
+            _rod_template_cache[key] = template
+        return _rod_template_cache[key]
+
+
+def create_straight_rod(
+    rod_params: StraightRodParams,
+    material: MaterialParams,
+) -> ea.CosseratRod:
+    """
+    Create a straight Cosserat rod with specified parameters.
+
+    Rods are instantiated from a cached template with the same resolution,
+    geometry and stiffness: the template arrays are copied, rigidly moved to the
+    requested pose and re-scaled to the requested density.
+    """
+    start_position = np.array(rod_params.start_position, dtype=np.float64)
+    direction = np.array(rod_params.direction, dtype=np.float64)
+    normal = np.array(rod_params.normal, dtype=np.float64)
+
+    # The template pose only covers a unit direction and a perpendicular
+    # normal; anything else is left to (and validated by) elastica.
+    normal_norm = np.linalg.norm(normal)
+    if (
+        normal_norm == 0.0
+        or not np.isclose(np.linalg.norm(direction), 1.0)
+        or not np.isclose(direction @ normal / normal_norm, 0.0)
+    ):
+        return _build_straight_rod(
+            rod_params.n_elem,
+            start_position,
+            direction,
+            normal,
+            rod_params.base_length,
+            rod_params.base_radius,
+            material,
+        )
+    normal /= normal_norm
+
+    template_density, template = _get_rod_template(rod_params, material)
+    rod = _copy_rod(template)
+
+    # Rotation taking the template frame (normal, binormal, direction) to the
+    # requested one.
+    rotation = np.column_stack((np.cross(normal, direction), normal, direction))
+    for name in _LAB_FRAME_VECTOR_FIELDS:
+        setattr(rod, name, rotation @ getattr(rod, name))
+    rod.position_collection += start_position[:, np.newaxis]
+    rod.director_collection = np.einsum(
+        "ijk,lj->ilk", rod.director_collection, rotation
     )
+
+    density_scale = material.density / template_density
+    if density_scale != 1.0:
+        for name in _DENSITY_FIELDS:
+            setattr(rod, name, getattr(rod, name) * density_scale)
+        for name in _INVERSE_DENSITY_FIELDS:
+            setattr(rod, name, getattr(rod, name) / density_scale)
+
+    return rod
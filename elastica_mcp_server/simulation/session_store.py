@@ -0,0 +1,197 @@
+from typing import Any, Iterator
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+SESSION_DIR_ENV = "ELASTICA_MCP_SESSION_DIR"
+MANIFEST_NAME = "manifest.json"
+FORMAT_VERSION = 3
+
+
+class StoredSamples:
+    """
+    Sequence of samples whose prefix is a stored, memory-mapped array.
+
+    New samples are appended in memory, so restoring a session does not create
+    one Python object per stored sample.
+    """
+
+    def __init__(self, stored: np.ndarray) -> None:
+        self.stored = stored
+        self.appended: list[Any] = []
+
+    def append(self, sample: Any) -> None:
+        self.appended.append(sample)
+
+    def __len__(self) -> int:
+        return len(self.stored) + len(self.appended)
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Sample index out of range")
+        if index < len(self.stored):
+            return self.stored[index]
+        return self.appended[index - len(self.stored)]
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self.stored
+        yield from self.appended
+
+    def __array__(self, dtype: Any = None, copy: bool | None = None) -> np.ndarray:
+        array = np.asarray(self.stored)
+        if self.appended:
+            array = np.concatenate((array, np.asarray(self.appended)))
+        return array if dtype is None else array.astype(dtype)
+
+
+class SessionStore:
+    """
+    On-disk store of simulation sessions.
+
+    Each session lives in its own directory and consists of a JSON manifest, one
+    `.npy` file per fixed-size array, and one raw append-only file per sample
+    series. Saving only writes the samples added since the last save, and arrays
+    are loaded memory-mapped, so neither saving nor opening a session reads the
+    stored history.
+
+    Every save writes its arrays under a new generation number. The manifest,
+    replaced last and atomically, names the generation and the number of valid
+    samples of each series, and older generations are deleted afterwards. An
+    interrupted save therefore leaves the previous session intact.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def _session_dir(self, simulator_tag: str) -> str:
+        # Tags are user-provided; hash them to obtain a safe directory name.
+        digest = hashlib.sha1(
+            simulator_tag.encode("utf-8"), usedforsecurity=False
+        ).hexdigest()
+        return os.path.join(self.root, digest)
+
+    def __contains__(self, simulator_tag: str) -> bool:
+        return os.path.isfile(
+            os.path.join(self._session_dir(simulator_tag), MANIFEST_NAME)
+        )
+
+    def save(
+        self,
+        simulator_tag: str,
+        manifest: dict[str, Any],
+        arrays: dict[str, np.ndarray],
+    ) -> None:
+        """
+        Write a session to the store, replacing any previous version.
+
+        Args:
+            simulator_tag: The tag of the simulator.
+            manifest: JSON-serializable description of the session.
+            arrays: Named arrays of the session.
+        """
+        session_dir = self._session_dir(simulator_tag)
+        os.makedirs(session_dir, exist_ok=True)
+        generation = (
+            self.load_manifest(simulator_tag)["generation"] + 1
+            if simulator_tag in self
+            else 0
+        )
+
+        for name, array in arrays.items():
+            path = os.path.join(session_dir, f"{name}.{generation}.npy")
+            with open(path, "wb") as f:
+                np.save(f, array, allow_pickle=False)
+
+        manifest = {
+            **manifest,
+            "format_version": FORMAT_VERSION,
+            "simulator_tag": simulator_tag,
+            "generation": generation,
+            "arrays": sorted(arrays),
+        }
+        path = os.path.join(session_dir, MANIFEST_NAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(path + ".tmp", path)
+
+        # Only now is the previous generation no longer referenced.
+        for file_name in os.listdir(session_dir):
+            if file_name.endswith(".npy") and not file_name.endswith(
+                f".{generation}.npy"
+            ):
+                os.remove(os.path.join(session_dir, file_name))
+
+    def load_manifest(self, simulator_tag: str) -> dict[str, Any]:
+        """
+        Read the manifest of a stored session.
+        """
+        path = os.path.join(self._session_dir(simulator_tag), MANIFEST_NAME)
+        with open(path) as f:
+            manifest: dict[str, Any] = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported session format version for {simulator_tag}: {manifest.get('format_version')}"
+            )
+        return manifest
+
+    def load_array(self, simulator_tag: str, name: str, generation: int) -> np.ndarray:
+        """
+        Open a stored array of the given generation memory-mapped (read-only).
+        """
+        path = os.path.join(
+            self._session_dir(simulator_tag), f"{name}.{generation}.npy"
+        )
+        array: np.ndarray = np.load(path, mmap_mode="r", allow_pickle=False)
+        return array
+
+    def append_samples(
+        self, simulator_tag: str, name: str, samples: np.ndarray, stored_count: int
+    ) -> None:
+        """
+        Append samples to a stored sample series.
+
+        Args:
+            simulator_tag: The tag of the simulator.
+            name: The name of the sample series.
+            samples: The new samples, stacked along the first axis.
+            stored_count: Number of valid samples already stored. Bytes beyond
+                them, left over from an interrupted save, are discarded.
+        """
+        session_dir = self._session_dir(simulator_tag)
+        os.makedirs(session_dir, exist_ok=True)
+        samples = np.ascontiguousarray(samples)
+        sample_nbytes = samples[0].nbytes if len(samples) > 0 else 0
+
+        path = os.path.join(session_dir, f"{name}.bin")
+        with open(path, "r+b" if stored_count > 0 else "wb") as f:
+            f.truncate(stored_count * sample_nbytes)
+            f.seek(0, os.SEEK_END)
+            f.write(samples.tobytes())
+
+    def load_samples(
+        self,
+        simulator_tag: str,
+        name: str,
+        dtype: str,
+        sample_shape: list[int],
+        count: int,
+    ) -> np.ndarray:
+        """
+        Open the first count samples of a stored sample series memory-mapped
+        (read-only).
+        """
+        path = os.path.join(self._session_dir(simulator_tag), f"{name}.bin")
+        return np.memmap(
+            path, dtype=np.dtype(dtype), mode="r", shape=(count, *sample_shape)
+        )
+
+    def delete(self, simulator_tag: str) -> None:
+        shutil.rmtree(self._session_dir(simulator_tag), ignore_errors=True)
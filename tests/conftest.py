@@ -0,0 +1,52 @@
+from typing import Callable
+
+import pytest
+
+from elastica_mcp_server.material import MaterialParams, material_factory
+from elastica_mcp_server.simulation.manager import Manager, SimulationInstance
+from elastica_mcp_server.simulation.rod_strategy import StraightRodParams
+
+SimulatorFactory = Callable[..., SimulationInstance]
+
+
+@pytest.fixture
+def build_simulator() -> SimulatorFactory:
+    """
+    Factory of simulators holding one MuscleHydrostat rod, tagged "rod", in the
+    pose of the snake example.
+
+    The factory takes the simulator tag and, optionally, the number of elements,
+    whether to add the snake muscle torques and ground contact, whether to
+    finalize, and the manager to create the simulator in (a fresh Manager()
+    by default).
+    """
+
+    def build(
+        simulator_tag: str,
+        n_elem: int = 50,
+        snake_motion: bool = False,
+        finalize: bool = False,
+        manager: Manager | None = None,
+    ) -> SimulationInstance:
+        if manager is None:
+            manager = Manager()
+        manager.create_simulation(simulator_tag)
+        simulator = manager[simulator_tag]
+
+        material = MaterialParams(**material_factory("MuscleHydrostat"))
+        rod_params = StraightRodParams(
+            start_position=(0.0, 0.0, 0.0),
+            direction=(0.0, 0.0, 1.0),
+            normal=(0.0, 1.0, 0.0),
+            base_length=0.35,
+            base_radius=0.35 * 0.011,
+            n_elem=n_elem,
+        )
+        simulator.create_rod("rod", rod_params, material)
+        if snake_motion:
+            simulator.mimic_snake_motion("rod", rod_params)
+        if finalize:
+            simulator.finalize()
+        return simulator
+
+    return build
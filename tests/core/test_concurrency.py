@@ -0,0 +1,69 @@
+"""
+Tests for the per-simulator locking and read coalescing.
+"""
+
+import threading
+import time
+
+from elastica_mcp_server.simulation.concurrency import ReadMemo, ReadWriteLock
+
+
+def test_read_write_lock_excludes_writer_from_readers() -> None:
+    """
+    Readers share the lock, while a writer waits for all of them.
+    """
+    lock = ReadWriteLock()
+    events: list[str] = []
+
+    def writer() -> None:
+        with lock.write():
+            events.append("write")
+
+    with lock.read(), lock.read():
+        thread = threading.Thread(target=writer)
+        thread.start()
+        time.sleep(0.05)
+        events.append("read")
+    thread.join()
+
+    assert events == ["read", "write"]
+
+
+def test_read_memo_coalesces_concurrent_reads() -> None:
+    """
+    Concurrent reads at the same simulation time compute the value once.
+    """
+    memo = ReadMemo()
+    n_computations = 0
+
+    def compute() -> list[float]:
+        nonlocal n_computations
+        n_computations += 1
+        time.sleep(0.05)
+        return [1.0]
+
+    results: list[list[float]] = []
+    threads = [
+        threading.Thread(target=lambda: results.append(memo.get("key", 0.0, compute)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert n_computations == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_read_memo_is_invalidated_by_simulation_time() -> None:
+    """
+    A memoized value is recomputed once the simulation time changes.
+    """
+    memo = ReadMemo()
+    first = memo.get("key", 0.0, lambda: [0.0])
+
+    assert memo.get("key", 0.0, lambda: [1.0]) is first
+    assert memo.get("key", 0.1, lambda: [1.0]) == [1.0]
+    memo.clear()
+    assert memo.get("key", 0.1, lambda: [2.0]) == [2.0]
@@ -0,0 +1,93 @@
+"""
+Tests for the custom forcing expressions.
+"""
+
+import numpy as np
+import pytest
+
+from elastica_mcp_server.simulation import expression_forcing
+from elastica_mcp_server.simulation.expression_forcing import (
+    compile_expression,
+    parse_expression,
+)
+
+
+def test_compile_expression_is_vectorized() -> None:
+    """
+    The kernel evaluates every component over all nodes at once.
+    """
+    kernel = compile_expression(("x + s", "2 * t", "sin(pi * z)"))
+    x = np.array([0.0, 1.0, 2.0])
+    s = np.array([0.0, 0.5, 1.0])
+    z = np.array([0.0, 0.5, 1.0])
+
+    result = kernel(x, np.zeros(3), z, 0.25, s)
+
+    np.testing.assert_allclose(result[0], x + s)
+    np.testing.assert_allclose(result[1], 0.5)
+    np.testing.assert_allclose(result[2], np.sin(np.pi * z), atol=1e-12)
+
+
+def test_compile_expression_is_cached() -> None:
+    """
+    Expressions that differ only in formatting share the compiled kernel.
+    """
+    kernel = compile_expression(("x+1", "0", "t"))
+    assert compile_expression((" x + 1 ", "0", "t")) is kernel
+    assert compile_expression(("x + 2", "0", "t")) is not kernel
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os')",
+        "x.__class__",
+        "open('file')",
+        "q + 1",
+        "[x, y]",
+        "x if t else y",
+        "'abc'",
+        "sin(x=1)",
+        "x +",
+        "sin(x, y)",
+        "exp(x, y)",
+        "sin",
+        "arctan2(x)",
+        "minimum(x, y, z)",
+    ],
+)
+def test_parse_expression_rejects_unsafe_input(expression: str) -> None:
+    """
+    Anything but arithmetic on the allowed names is rejected.
+    """
+    with pytest.raises(ValueError):
+        parse_expression(expression)
+
+
+def test_kernel_cache_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    The oldest kernels are evicted once the cache is full.
+    """
+    monkeypatch.setattr(expression_forcing, "EXPRESSION_KERNEL_CACHE_SIZE", 2)
+    monkeypatch.setattr(expression_forcing, "_kernel_cache", {})
+
+    first = compile_expression(("x", "0", "1"))
+    compile_expression(("x", "0", "2"))
+    compile_expression(("x", "0", "3"))
+
+    assert len(expression_forcing._kernel_cache) == 2
+    assert compile_expression(("x", "0", "1")) is not first
+
+
+def test_kernel_inputs_are_read_only(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Even if an output argument slipped through the parser, the kernel could not
+    write into its inputs.
+    """
+    monkeypatch.setitem(expression_forcing.EXPRESSION_FUNCTION_ARITY, "exp", 2)
+    kernel = compile_expression(("0", "exp(x, y)", "0"))
+    y = np.zeros(3)
+
+    with pytest.raises(ValueError, match="read-only"):
+        kernel(np.ones(3), y, np.zeros(3), 0.0, np.zeros(3))
+    np.testing.assert_array_equal(y, 0.0)
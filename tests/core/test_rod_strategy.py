@@ -0,0 +1,138 @@
+"""
+Tests for the cached straight rod construction.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import elastica as ea
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from elastica_mcp_server.material import MaterialParams
+from elastica_mcp_server.simulation import rod_strategy
+from elastica_mcp_server.simulation.rod_strategy import (
+    MAX_N_ELEM,
+    StraightRodParams,
+    create_straight_rod,
+)
+
+
+def _reference_rod(
+    rod_params: StraightRodParams, material: MaterialParams
+) -> ea.CosseratRod:
+    return ea.CosseratRod.straight_rod(
+        rod_params.n_elem,
+        np.array(rod_params.start_position),
+        np.array(rod_params.direction),
+        np.array(rod_params.normal),
+        rod_params.base_length,
+        rod_params.base_radius,
+        material.density,
+        youngs_modulus=material.youngs_modulus,
+        shear_modulus=material.youngs_modulus / (1 + material.poisson_ratio),
+    )
+
+
+@pytest.mark.parametrize(
+    ("start_position", "direction", "normal", "density"),
+    [
+        ((0.0, 0.0, 0.0), (0.0, 0.0, 1.0), (0.0, 1.0, 0.0), 1000.0),
+        ((0.1, -0.2, 0.3), (1.0, 0.0, 0.0), (0.0, 0.0, 1.0), 1000.0),
+        ((0.0, 0.0, 0.0), (0.0, 0.6, 0.8), (0.0, 0.8, -0.6), 3000.0),
+        ((1.0, 2.0, 3.0), (0.0, 0.0, -1.0), (1.0, 0.0, 0.0), 500.0),
+    ],
+)
+def test_cached_rod_matches_straight_rod(
+    start_position: tuple[float, float, float],
+    direction: tuple[float, float, float],
+    normal: tuple[float, float, float],
+    density: float,
+) -> None:
+    """
+    Rods copied from the template match rods built from scratch.
+    """
+    rod_params = StraightRodParams(
+        start_position=start_position,
+        direction=direction,
+        normal=normal,
+        base_length=0.35,
+        base_radius=0.35 * 0.011,
+        n_elem=20,
+    )
+    material = MaterialParams(density=density, youngs_modulus=1e6)
+
+    # Build a template with a different density first.
+    create_straight_rod(rod_params, MaterialParams(density=1000.0, youngs_modulus=1e6))
+    rod = create_straight_rod(rod_params, material)
+    reference = _reference_rod(rod_params, material)
+
+    for name, value in vars(reference).items():
+        if isinstance(value, np.ndarray):
+            np.testing.assert_allclose(
+                getattr(rod, name), value, rtol=1e-12, atol=1e-12, err_msg=name
+            )
+
+
+def test_cached_rods_do_not_share_state() -> None:
+    """
+    Every rod owns its arrays, so simulating one does not affect another.
+    """
+    rod_params = StraightRodParams(
+        start_position=(0.0, 0.0, 0.0),
+        direction=(0.0, 0.0, 1.0),
+        normal=(0.0, 1.0, 0.0),
+        base_length=0.35,
+        base_radius=0.35 * 0.011,
+    )
+    material = MaterialParams(density=1000.0, youngs_modulus=1e6)
+
+    rod = create_straight_rod(rod_params, material)
+    other = create_straight_rod(rod_params, material)
+    rod.position_collection[...] = 1.0
+
+    assert not np.any(other.position_collection == 1.0)
+
+
+def test_concurrent_rod_creation_keeps_cache_bounded(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Rods created from several threads evict templates without racing.
+    """
+    monkeypatch.setattr(rod_strategy, "ROD_TEMPLATE_CACHE_SIZE", 2)
+    monkeypatch.setattr(rod_strategy, "_rod_template_cache", {})
+    material = MaterialParams(density=1000.0, youngs_modulus=1e6)
+
+    def create(index: int) -> ea.CosseratRod:
+        rod_params = StraightRodParams(
+            start_position=(0.0, 0.0, 0.0),
+            direction=(0.0, 0.0, 1.0),
+            normal=(0.0, 1.0, 0.0),
+            base_length=0.1 + 0.01 * (index % 8),
+            base_radius=0.01,
+            n_elem=10,
+        )
+        return create_straight_rod(rod_params, material)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        rods = list(executor.map(create, range(64)))
+
+    assert len(rods) == 64
+    assert len(rod_strategy._rod_template_cache) <= 2
+
+
+@pytest.mark.parametrize("n_elem", [0, -1, MAX_N_ELEM + 1])
+def test_rod_params_reject_invalid_resolution(n_elem: int) -> None:
+    """
+    The number of elements must be positive and bounded.
+    """
+    with pytest.raises(ValidationError):
+        StraightRodParams(
+            start_position=(0.0, 0.0, 0.0),
+            direction=(0.0, 0.0, 1.0),
+            normal=(0.0, 1.0, 0.0),
+            base_length=0.35,
+            base_radius=0.35 * 0.011,
+            n_elem=n_elem,
+        )
@@ -0,0 +1,85 @@
+import elastica as ea
+import numpy as np
+
+from elastica_mcp_server.simulation.environment import Simulator
+from elastica_mcp_server.simulation.manager import SimulationInstance
+from elastica_mcp_server.material import MaterialParams, material_factory
+from elastica_mcp_server.simulation.rod_strategy import (
+    StraightRodParams,
+    create_straight_rod,
+)
+
+ROD_PARAMS = [
+    StraightRodParams(
+        start_position=(0.0, 0.0, 0.0),
+        direction=(0.0, 0.0, 1.0),
+        normal=(0.0, 1.0, 0.0),
+        base_length=0.35,
+        base_radius=0.35 * 0.011,
+    ),
+    StraightRodParams(
+        start_position=(0.1, 0.0, 0.0),
+        direction=(1.0, 0.0, 0.0),
+        normal=(0.0, 0.0, 1.0),
+        base_length=0.2,
+        base_radius=0.01,
+        n_elem=20,
+    ),
+    StraightRodParams(
+        start_position=(0.0, 0.2, 0.0),
+        direction=(0.0, 0.6, 0.8),
+        normal=(0.0, 0.8, -0.6),
+        base_length=0.5,
+        base_radius=0.02,
+        n_elem=30,
+    ),
+]
+
+
+def test_batched_operators_match_per_rod_operators():
+    """
+    Batched gravity and damping reproduce per-rod GravityForces and
+    AnalyticalLinearDamper.
+    """
+    material = MaterialParams(**material_factory("SoftMaterial"))
+    time_step = 1e-4
+    n_steps = 200
+
+    instance = SimulationInstance("batched")
+    for k, rod_params in enumerate(ROD_PARAMS):
+        instance.create_rod(f"rod{k}", rod_params, material)
+        # Spin the rods, so that rotational damping takes effect.
+        instance.rods[f"rod{k}"].omega_collection[...] = 1.0
+    instance.finalize()
+    instance.run_simulation(n_steps * time_step)
+
+    assert len(instance.gravity_groups) == 1
+    assert len(instance.damping_groups) == 1
+
+    reference = Simulator()
+    reference_rods = []
+    for rod_params in ROD_PARAMS:
+        rod = create_straight_rod(rod_params, material)
+        rod.omega_collection[...] = 1.0
+        reference.append(rod)
+        reference.add_forcing_to(rod).using(
+            ea.GravityForces, acc_gravity=np.array([0.0, -9.80665, 0.0])
+        )
+        reference.dampen(rod).using(
+            ea.AnalyticalLinearDamper, damping_constant=2e-3, time_step=time_step
+        )
+        reference_rods.append(rod)
+    reference.finalize()
+    timestepper = ea.PositionVerlet()
+    time = np.float64(0.0)
+    for _ in range(n_steps):
+        time = timestepper.step(reference, time, np.float64(time_step))
+
+    for k, reference_rod in enumerate(reference_rods):
+        rod = instance.rods[f"rod{k}"]
+        np.testing.assert_allclose(
+            rod.position_collection, reference_rod.position_collection, atol=1e-12
+        )
+        np.testing.assert_allclose(
+            rod.omega_collection, reference_rod.omega_collection, rtol=1e-9
+        )
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+
+def test_uniform_expression_force_accelerates_center_of_mass(build_simulator):
+    """
+    A uniform nodal force accelerates the center of mass by n_nodes * F / M.
+    """
+    simulator = build_simulator("expression")
+    simulator.add_expression_forcing("rod", ("1e-3", "0", "0"), "force")
+    simulator.finalize()
+
+    run_time = 0.01
+    simulator.run_simulation(run_time)
+
+    rod = simulator.rods["rod"]
+    expected_velocity = rod.n_nodes * 1e-3 * simulator.simulation_time / rod.mass.sum()
+    np.testing.assert_allclose(
+        rod.compute_velocity_center_of_mass()[0], expected_velocity, rtol=1e-3
+    )
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        ("10.0**400", "0", "0"),
+        ("1/0", "0", "0"),
+        ("log(0*x)", "0", "0"),
+        ("0", "sqrt(-1 - z)", "0"),
+    ],
+)
+def test_invalid_expression_is_rejected_when_added(expression, build_simulator):
+    """
+    Expressions that fail or give non-finite values on the rod are rejected
+    before they reach the scene.
+    """
+    simulator = build_simulator("invalid")
+
+    with pytest.raises(ValueError):
+        simulator.add_expression_forcing("rod", expression, "force")
+    assert all(
+        entry["operation"] != "add_expression_forcing" for entry in simulator.scene_spec
+    )
+
+
+def test_expression_forcing_after_finalize_is_rejected(build_simulator):
+    """
+    Forcing cannot be added once the simulator is finalized.
+    """
+    simulator = build_simulator("finalized", finalize=True)
+
+    with pytest.raises(ValueError, match="finalized"):
+        simulator.add_expression_forcing("rod", ("1e-3", "0", "0"), "force")
@@ -0,0 +1,51 @@
+import anyio
+import pytest
+
+from elastica_mcp_server import loadtest
+from elastica_mcp_server.loadtest import LoadTestConfig, run_load_test
+
+
+def test_load_test_report():
+    """
+    Run a small load test and check that every issued call is accounted for.
+    """
+    config = LoadTestConfig(n_clients=2, n_operations=8, run_time=1e-3)
+    report = anyio.run(run_load_test, config)
+
+    assert report["errors"] == {}
+    assert report["skipped"] == {}
+    assert report["total_calls"] == sum(
+        summary["count"] for summary in report["per_tool"].values()
+    )
+    assert report["throughput"] > 0
+    for summary in report["per_tool"].values():
+        assert summary["p50_ms"] <= summary["p95_ms"] <= summary["p99_ms"]
+
+
+def test_load_test_config_validation():
+    """
+    Configurations the server cannot serve are rejected before the load test starts.
+    """
+    with pytest.raises(ValueError, match="Number of clients"):
+        LoadTestConfig(n_clients=12)
+    with pytest.raises(ValueError, match="Invalid operation names"):
+        LoadTestConfig(operation_mix={"get_velocity": 1.0})
+    with pytest.raises(ValueError, match="Operation weights"):
+        LoadTestConfig(operation_mix={"run_simulation": 0.0})
+
+
+def test_load_test_reports_failed_setup(monkeypatch):
+    """
+    Clients whose rod creation fails record failures instead of aborting the test.
+    """
+    monkeypatch.setitem(loadtest.DEFAULT_ROD_PARAMS, "base_length", -1.0)
+    config = LoadTestConfig(
+        n_clients=2,
+        n_operations=4,
+        operation_mix={"get_current_position": 1.0},
+        run_time=1e-3,
+    )
+    report = anyio.run(run_load_test, config)
+
+    assert report["errors"]["create_rod"] > 0
+    assert report["skipped"]["get_current_position"] > 0
@@ -0,0 +1,140 @@
+import time
+
+import numpy as np
+import pytest
+
+from elastica_mcp_server.simulation.preview import (
+    coarsen_scene_spec,
+    estimate_error,
+    preview_simulation,
+)
+
+
+def test_coarsen_scene_spec():
+    """
+    Coarsening only touches the rod resolution and appends finalize.
+    """
+    scene_spec = [
+        {
+            "operation": "create_rod",
+            "rod_tag": "rod",
+            "rod_params": {"n_elem": 40, "base_length": 1.0},
+            "material": {"density": 1000.0},
+        },
+    ]
+
+    coarse_spec = coarsen_scene_spec(scene_spec, 4.0)
+
+    assert coarse_spec[0]["rod_params"] == {"n_elem": 10, "base_length": 1.0}
+    assert coarse_spec[-1] == {"operation": "finalize"}
+    assert scene_spec[0]["rod_params"]["n_elem"] == 40
+
+    # Rods are never refined to reach MIN_PREVIEW_N_ELEM.
+    scene_spec[0]["rod_params"]["n_elem"] = 2
+    assert coarsen_scene_spec(scene_spec, 4.0)[0]["rod_params"]["n_elem"] == 2
+
+
+@pytest.mark.parametrize(("n_elem", "reference_n_elem"), [(10, 5), (6, 5), (20, 12)])
+def test_estimate_error_matches_first_order_convergence(n_elem, reference_n_elem):
+    """
+    For a value converging at first order in the element length, the estimate
+    recovers the exact error of the preview, whatever the reference resolution.
+    """
+    exact_value = np.array([1.0, -2.0, 0.5])
+    error_coefficient = np.array([0.3, 0.1, -0.2])
+
+    def value_at(n):
+        return exact_value + error_coefficient / n
+
+    error = estimate_error(
+        value_at(n_elem), value_at(reference_n_elem), n_elem, reference_n_elem
+    )
+
+    np.testing.assert_allclose(
+        error, np.linalg.norm(value_at(n_elem) - exact_value), rtol=1e-12
+    )
+    assert estimate_error(1.0, 2.0, 5, 5) is None
+
+
+def test_preview_snake(build_simulator):
+    """
+    Preview the snake scene at a coarse resolution without touching the simulator.
+    """
+    simulator = build_simulator("snake", n_elem=40, snake_motion=True)
+
+    result = preview_simulation(
+        simulator, run_time=0.05, coarsening_factor=4.0, estimate_errors=True
+    )
+
+    # Ground contact limits the time step, so it is not scaled.
+    assert result["time_step"] == simulator.time_step
+    assert result["rods"]["rod"]["n_elem"] == 10
+    assert np.isfinite(result["rods"]["rod"]["forward_velocity"])
+    assert result["rods"]["rod"]["forward_velocity_error"] >= 0.0
+    assert simulator.simulation_time == 0.0
+    assert simulator.rods["rod"].n_elems == 40
+
+
+def test_preview_scales_time_step_without_contact(build_simulator):
+    """
+    Without contact, the preview time step grows with the element length.
+    """
+    simulator = build_simulator("hanging", n_elem=40)
+
+    result = preview_simulation(simulator, run_time=0.05, coarsening_factor=4.0)
+
+    assert result["time_step"] == simulator.time_step * 4.0
+    assert result["rods"]["rod"]["forward_velocity_error"] is None
+    assert np.all(np.isfinite(result["rods"]["rod"]["center_of_mass_displacement"]))
+
+
+def test_preview_error_is_none_at_minimum_resolution(build_simulator):
+    """
+    When the reference run cannot be coarser than the preview, no error is reported.
+    """
+    simulator = build_simulator("short", n_elem=20)
+
+    result = preview_simulation(
+        simulator, run_time=0.01, coarsening_factor=4.0, estimate_errors=True
+    )
+
+    assert result["rods"]["rod"]["n_elem"] == 5
+    assert result["rods"]["rod"]["forward_velocity_error"] is None
+    assert result["rods"]["rod"]["center_of_mass_displacement_error"] is None
+
+
+def test_preview_error_of_resolution_independent_motion_vanishes(build_simulator):
+    """
+    Metrics are taken at the end of the run, so runs with different time steps
+    agree on a free fall, which does not depend on the resolution.
+    """
+    simulator = build_simulator("falling")
+
+    result = preview_simulation(
+        simulator, run_time=0.2, coarsening_factor=8.0, estimate_errors=True
+    )
+
+    assert result["rods"]["rod"]["center_of_mass_displacement_error"] < 1e-9
+
+
+def test_contact_preview_is_cheaper_than_full_run(build_simulator):
+    """
+    Without error estimation, previewing a contact scene costs less than
+    running it at full resolution, although the time step is not scaled.
+    """
+    simulator = build_simulator("snake", snake_motion=True)
+
+    # Warm up both resolutions before timing.
+    preview_simulation(simulator, run_time=0.01)
+    run_time = 0.3
+    start_time = time.perf_counter()
+    preview_simulation(simulator, run_time=run_time)
+    preview_walltime = time.perf_counter() - start_time
+
+    simulator.finalize()
+    simulator.run_simulation(0.01)
+    start_time = time.perf_counter()
+    simulator.run_simulation(run_time)
+    full_walltime = time.perf_counter() - start_time
+
+    assert preview_walltime < full_walltime
@@ -0,0 +1,13 @@
+def test_reads_are_memoized_until_the_simulation_advances(build_simulator):
+    """
+    Repeated reads without stepping are served from the memo, and running the
+    simulation invalidates it.
+    """
+    simulator = build_simulator("memo", snake_motion=True, finalize=True)
+    simulator.run_simulation(0.01)
+
+    position = simulator.get_current_position("rod")
+    assert simulator.get_current_position("rod") is position
+
+    simulator.run_simulation(simulator.time_step * simulator.step_skip)
+    assert simulator.get_current_position("rod") is not position
@@ -0,0 +1,138 @@
+import json
+
+import numpy as np
+import pytest
+
+from elastica_mcp_server.simulation.manager import Manager
+from elastica_mcp_server.simulation.session_store import SessionStore, StoredSamples
+
+
+def test_warm_restart_matches_uninterrupted_run(tmp_path, build_simulator):
+    """
+    A session restored from the store continues exactly like an uninterrupted run.
+    """
+    manager = Manager()
+    build_simulator("reference", snake_motion=True, finalize=True, manager=manager)
+    manager["reference"].run_simulation(0.1)
+    reference = manager["reference"]
+
+    store = SessionStore(str(tmp_path))
+    manager = Manager(session_store=store)
+    build_simulator("snake", snake_motion=True, finalize=True, manager=manager)
+    manager["snake"].run_simulation(0.05)
+    manager.save_simulation("snake")
+
+    # Re-initializing the singleton drops all in-memory sessions.
+    manager = Manager(session_store=store)
+    assert manager.simulations == {}
+
+    restored = manager["snake"]
+    assert abs(restored.simulation_time - 0.05) < 1e-9
+    restored.run_simulation(0.05)
+
+    np.testing.assert_allclose(
+        restored.rods["rod"].position_collection,
+        reference.rods["rod"].position_collection,
+    )
+    assert len(restored.callbacks["rod"]["time"]) == len(
+        reference.callbacks["rod"]["time"]
+    )
+    np.testing.assert_allclose(
+        restored.get_current_position("rod"), reference.get_current_position("rod")
+    )
+
+
+def test_deleted_session_is_not_restored(tmp_path, build_simulator):
+    """
+    Deleting a simulator also removes its stored session.
+    """
+    store = SessionStore(str(tmp_path))
+    manager = Manager(session_store=store)
+    build_simulator("snake", snake_motion=True, finalize=True, manager=manager)
+    manager.save_simulation("snake")
+    assert "snake" in store
+
+    manager.delete_simulation("snake")
+    assert "snake" not in store
+
+
+def test_diagnostics_are_appended_incrementally(tmp_path, build_simulator):
+    """
+    Saving again only appends the new diagnostics, and a restored session reads
+    them memory-mapped.
+    """
+    manager = Manager()
+    build_simulator("reference", snake_motion=True, finalize=True, manager=manager)
+    manager["reference"].run_simulation(0.1)
+    reference = manager["reference"]
+
+    store = SessionStore(str(tmp_path))
+    manager = Manager(session_store=store)
+    build_simulator("snake", snake_motion=True, finalize=True, manager=manager)
+    manager["snake"].run_simulation(0.05)
+    manager.save_simulation("snake")
+    first_count = store.load_manifest("snake")["diagnostics"]["rod"]["time"]["count"]
+
+    manager = Manager(session_store=store)
+    restored = manager["snake"]
+    assert isinstance(restored.callbacks["rod"]["time"], StoredSamples)
+    assert isinstance(restored.callbacks["rod"]["time"].stored, np.memmap)
+    restored.run_simulation(0.05)
+    manager.save_simulation("snake")
+
+    manager = Manager(session_store=store)
+    restored = manager["snake"]
+    time = restored.callbacks["rod"]["time"]
+    assert len(time.stored) > first_count
+    assert time.appended == []
+    np.testing.assert_allclose(np.asarray(time), reference.callbacks["rod"]["time"])
+    np.testing.assert_allclose(
+        np.asarray(restored.callbacks["rod"]["center_of_mass"]),
+        reference.callbacks["rod"]["center_of_mass"],
+    )
+
+
+def test_interrupted_save_keeps_previous_session(
+    tmp_path, monkeypatch, build_simulator
+):
+    """
+    A save that fails before the manifest is replaced leaves the previous
+    session, rod state included, intact.
+    """
+    store = SessionStore(str(tmp_path))
+    manager = Manager(session_store=store)
+    build_simulator("snake", snake_motion=True, finalize=True, manager=manager)
+    manager["snake"].run_simulation(0.01)
+    manager.save_simulation("snake")
+    position = manager["snake"].rods["rod"].position_collection.copy()
+
+    manager["snake"].run_simulation(0.01)
+
+    def fail(*args, **kwargs):
+        raise OSError("Interrupted")
+
+    monkeypatch.setattr(json, "dump", fail)
+    with pytest.raises(OSError):
+        manager.save_simulation("snake")
+    monkeypatch.undo()
+
+    manager = Manager(session_store=store)
+    restored = manager["snake"]
+    assert abs(restored.simulation_time - 0.01) < 1e-9
+    np.testing.assert_allclose(restored.rods["rod"].position_collection, position)
+
+
+def test_stored_session_is_not_overwritten_by_create(tmp_path, build_simulator):
+    """
+    Creating a simulator with the tag of a stored session is an error, even
+    before the session is restored.
+    """
+    store = SessionStore(str(tmp_path))
+    manager = Manager(session_store=store)
+    build_simulator("snake", snake_motion=True, finalize=True, manager=manager)
+    manager.save_simulation("snake")
+
+    manager = Manager(session_store=store)
+    with pytest.raises(ValueError, match="already exists"):
+        manager.create_simulation("snake")
+    assert "snake" in store
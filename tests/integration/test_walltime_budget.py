@@ -0,0 +1,27 @@
+def test_walltime_budget_stops_at_step_boundary(build_simulator):
+    """
+    The budgeted run advances an integer number of steps within the budget.
+    """
+    simulator = build_simulator("budget", finalize=True)
+
+    start, end, steps, walltime = simulator.run_simulation_with_walltime_budget(0.2)
+
+    assert start == 0.0
+    assert steps > 0
+    assert end == simulator.simulation_time
+    assert abs(end - steps * simulator.time_step) < 1e-9
+    assert walltime < 1.0
+
+
+def test_walltime_budget_respects_max_run_time(build_simulator):
+    """
+    The optional simulated-time cap ends the run before the budget is used up.
+    """
+    simulator = build_simulator("budget_capped", finalize=True)
+
+    _, end, steps, _ = simulator.run_simulation_with_walltime_budget(
+        10.0, max_run_time=0.01
+    )
+
+    assert steps == int(0.01 / simulator.time_step)
+    assert abs(end - 0.01) < 1e-9